@@ -17,4 +17,14 @@ public interface IFileSystemService
     Task AppendAllTextAsync(
         string path,
         string content);
+
+    /// <summary>
+    ///     Create a new file with the given content, failing atomically if it already exists.
+    /// </summary>
+    /// <returns><c>false</c> if the file already existed and was left untouched.</returns>
+    Task<bool> TryCreateFileAsync(
+        string path,
+        string content);
+
+    Task<string> ReadAllTextAsync(string path);
 }
@@ -1,3 +1,4 @@
+using System.Collections.Concurrent;
 using System.Reflection;
 
 namespace AISwarm.Infrastructure;
@@ -10,7 +11,24 @@ public class ContextService : IContextService
     private const string DefaultPersonasDirectory = ".aiswarm|personas"; // '|' placeholder to be split
     private const string PersonasEnvironmentVariable = "AISWARM_PERSONAS_PATH";
 
-    private static readonly Dictionary<string, string> AgentResources = new()
+    private const string AgentIdSectionPrefix = @"
+
+## Your Agent ID
+
+Your unique agent ID is: `";
+
+    private const string AgentIdSectionSuffix = @"`
+**You MUST use this ID for all MCP tool interactions.**
+
+";
+
+    // Directory timestamps are coarse; listings taken within this window of the last change are not cached
+    private static readonly TimeSpan RacyWriteWindow = TimeSpan.FromSeconds(2);
+
+    private static readonly ConcurrentDictionary<string, (DateTime LastWriteTimeUtc, string[] Files)>
+        PersonaDirectoryCache = new();
+
+    private static readonly Dictionary<string, string> AgentResources = new(StringComparer.OrdinalIgnoreCase)
     {
         { "planner", "AISwarm.Infrastructure.Resources.planner_prompt.md" },
         { "implementer", "AISwarm.Infrastructure.Resources.implementer_prompt.md" },
@@ -19,45 +37,20 @@ public class ContextService : IContextService
     };
 
     /// <inheritdoc />
-    public async Task<string> CreateContextFile(
+    public Task<string> CreateContextFile(
         string agentType,
         string workingDirectory)
     {
-        Directory.CreateDirectory(workingDirectory);
-        var promptContent = GetAgentPrompt(agentType);
-        var contextFileName = $"{agentType}_context.md";
-        var contextFilePath = Path.Combine(workingDirectory, contextFileName);
-        await File.WriteAllTextAsync(contextFilePath, promptContent);
-        return contextFilePath;
+        return WriteContextFileAsync(agentType, workingDirectory, null);
     }
 
     /// <inheritdoc />
-    public async Task<string> CreateContextFileWithAgentId(
+    public Task<string> CreateContextFileWithAgentId(
         string agentType,
         string workingDirectory,
         string? agentId)
     {
-        // Create the base context file first
-        var contextFilePath = await CreateContextFile(agentType, workingDirectory);
-
-        // If agentId is provided, append agent ID and MCP tool instructions
-        if (!string.IsNullOrWhiteSpace(agentId))
-        {
-            var agentIdSection = $@"
-
-## Your Agent ID
-
-Your unique agent ID is: `{agentId}`
-**You MUST use this ID for all MCP tool interactions.**
-
-";
-            var mcpInstructions = GetMcpInstructions(agentId);
-            var fullInstructions = agentIdSection + mcpInstructions;
-
-            await File.AppendAllTextAsync(contextFilePath, fullInstructions);
-        }
-
-        return contextFilePath;
+        return WriteContextFileAsync(agentType, workingDirectory, agentId);
     }
 
     /// <inheritdoc />
@@ -74,9 +67,9 @@ Your unique agent ID is: `{agentId}`
     /// <inheritdoc />
     public bool IsValidAgentType(string agentType)
     {
-        if (AgentResources.ContainsKey(agentType.ToLowerInvariant()))
+        if (AgentResources.ContainsKey(agentType))
             return true;
-        return GetAllPersonaFiles().ContainsKey(agentType.ToLowerInvariant());
+        return GetAllPersonaFiles().ContainsKey(agentType);
     }
 
     /// <inheritdoc />
@@ -92,20 +85,69 @@ Your unique agent ID is: `{agentId}`
         return sources;
     }
 
-    private string GetAgentPrompt(string agentType)
+    private async Task<string> WriteContextFileAsync(
+        string agentType,
+        string workingDirectory,
+        string? agentId)
     {
+        Directory.CreateDirectory(workingDirectory);
+        var contextFileName = $"{agentType}_context.md";
+        var contextFilePath = Path.Combine(workingDirectory, contextFileName);
+
+        await using var prompt = OpenAgentPrompt(agentType, out var isEmbedded);
+        await using var contextFile = File.Create(contextFilePath);
+        await using var writer = new StreamWriter(contextFile);
+        if (isEmbedded)
+        {
+            // Embedded prompts are UTF-8 without a BOM, so copy the bytes through without a decode/encode round trip
+            await prompt.CopyToAsync(contextFile);
+        }
+        else
+        {
+            // External personas are user-supplied and may be UTF-16 or carry a BOM; decode them so the
+            // context file is written uniformly as UTF-8
+            using var reader = new StreamReader(prompt);
+            await writer.WriteAsync(await reader.ReadToEndAsync());
+        }
+
+        // If agentId is provided, append agent ID and MCP tool instructions through the same open file
+        if (!string.IsNullOrWhiteSpace(agentId))
+        {
+            await writer.WriteAsync(AgentIdSectionPrefix);
+            await writer.WriteAsync(agentId);
+            await writer.WriteAsync(AgentIdSectionSuffix);
+            await writer.WriteAsync(GetMcpInstructions(agentId));
+        }
+
+        return contextFilePath;
+    }
+
+    private static Stream OpenAgentPrompt(
+        string agentType,
+        out bool isEmbedded)
+    {
+        isEmbedded = false;
         var personaFiles = GetAllPersonaFiles();
-        if (personaFiles.TryGetValue(agentType.ToLowerInvariant(), out var filePath) && File.Exists(filePath))
-            return File.ReadAllText(filePath);
+        if (personaFiles.TryGetValue(agentType, out var filePath))
+        {
+            try
+            {
+                // Open directly rather than stat first; the open itself reports a missing file
+                return File.OpenRead(filePath);
+            }
+            catch (Exception ex) when (ex is FileNotFoundException or DirectoryNotFoundException)
+            {
+                // Removed since discovery - fall back to the embedded prompt below
+            }
+        }
 
-        if (!AgentResources.TryGetValue(agentType.ToLowerInvariant(), out var resourceName))
+        if (!AgentResources.TryGetValue(agentType, out var resourceName))
             throw new ArgumentException($"Unknown agent type: {agentType}", nameof(agentType));
 
+        isEmbedded = true;
         var assembly = Assembly.GetExecutingAssembly();
-        using var stream = assembly.GetManifestResourceStream(resourceName) ??
-                           throw new InvalidOperationException($"Resource not found: {resourceName}");
-        using var reader = new StreamReader(stream);
-        return reader.ReadToEnd();
+        return assembly.GetManifestResourceStream(resourceName) ??
+               throw new InvalidOperationException($"Resource not found: {resourceName}");
     }
 
     private string GetMcpInstructions(string agentId)
@@ -122,26 +164,63 @@ Your unique agent ID is: `{agentId}`
 
     private static Dictionary<string, string> GetAllPersonaFiles()
     {
-        var personaFiles = new Dictionary<string, string>();
+        // Case-insensitive so lookups never need to lower-case the caller's agent type
+        var personaFiles = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
         foreach (var directory in GetPersonaDirectories())
         {
-            if (!Directory.Exists(directory))
-                continue;
-            var files = Directory.GetFiles(directory, "*_prompt.md", SearchOption.TopDirectoryOnly);
+            var files = GetPersonaFilesInDirectory(directory);
             foreach (var file in files)
             {
                 var fileName = Path.GetFileNameWithoutExtension(file);
                 if (!fileName.EndsWith("_prompt"))
                     continue;
                 var agentType = fileName[..^"_prompt".Length];
-                if (!personaFiles.ContainsKey(agentType.ToLowerInvariant()))
-                    personaFiles[agentType.ToLowerInvariant()] = file;
+                personaFiles.TryAdd(agentType.ToLowerInvariant(), file);
             }
         }
 
         return personaFiles;
     }
 
+    /// <summary>
+    ///     List persona prompt files in a directory, reusing the previous listing while the directory's
+    ///     last write time is unchanged (adding, removing or renaming a file updates it).
+    /// </summary>
+    private static string[] GetPersonaFilesInDirectory(string directory)
+    {
+        DateTime lastWriteTimeUtc;
+        try
+        {
+            lastWriteTimeUtc = Directory.GetLastWriteTimeUtc(directory);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            // Unreachable directories (e.g. a parent without search permission) contribute no personas
+            // and are not cached, so they are picked up once they become reachable
+            return [];
+        }
+
+        if (PersonaDirectoryCache.TryGetValue(directory, out var cached) &&
+            cached.LastWriteTimeUtc == lastWriteTimeUtc)
+            return cached.Files;
+
+        string[] files;
+        try
+        {
+            // Enumerating directly folds the existence check into the directory read
+            files = Directory.EnumerateFiles(directory, "*_prompt.md", SearchOption.TopDirectoryOnly).ToArray();
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
+            // Missing or unreadable directories contribute no personas, as Directory.Exists did before
+            files = [];
+        }
+
+        if (DateTime.UtcNow - lastWriteTimeUtc > RacyWriteWindow)
+            PersonaDirectoryCache[directory] = (lastWriteTimeUtc, files);
+        return files;
+    }
+
     private static List<string> GetPersonaDirectories()
     {
         var directories = new List<string>
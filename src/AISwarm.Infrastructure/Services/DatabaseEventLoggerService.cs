@@ -32,6 +32,9 @@ public class DatabaseEventLoggerService(
     ITimeService timeService,
     IAppLogger logger) : IEventLoggerService, IDisposable
 {
+    // Reused so serializer metadata is built once rather than per logged event
+    private static readonly JsonSerializerOptions PayloadJsonOptions = new() { WriteIndented = false };
+
     private readonly IAgentNotificationService _agentNotifications = agentNotifications;
     private readonly IAppLogger _logger = logger;
     private readonly IDatabaseScopeService _scopeService = scopeService;
@@ -187,9 +190,7 @@ public class DatabaseEventLoggerService(
                 Timestamp = _timeService.UtcNow,
                 Actor = ExtractActorFromTaskEvent(taskEvent),
                 CorrelationId = null, // Event envelopes don't have correlation IDs
-                Payload =
-                    JsonSerializer.Serialize((object?)taskEvent.Payload,
-                        new JsonSerializerOptions { WriteIndented = false }),
+                Payload = JsonSerializer.Serialize((object?)taskEvent.Payload, PayloadJsonOptions),
                 EntityId = ExtractEntityIdFromTaskEvent(taskEvent),
                 EntityType = "Task",
                 Severity = GetSeverityFromTaskEvent(taskEvent),
@@ -221,8 +222,7 @@ public class DatabaseEventLoggerService(
                 Timestamp = _timeService.UtcNow,
                 Actor = ExtractActorFromAgentEvent(agentEvent),
                 CorrelationId = null, // Event envelopes don't have correlation IDs
-                Payload =
-                    JsonSerializer.Serialize(agentEvent.Payload, new JsonSerializerOptions { WriteIndented = false }),
+                Payload = JsonSerializer.Serialize(agentEvent.Payload, PayloadJsonOptions),
                 EntityId = agentEvent.Payload.AgentId,
                 EntityType = "Agent",
                 Severity = GetSeverityFromAgentEvent(agentEvent),
@@ -32,6 +32,26 @@ public class FileSystemService : IFileSystemService
         await File.AppendAllTextAsync(path, content);
     }
 
+    public async Task<bool> TryCreateFileAsync(
+        string path,
+        string content)
+    {
+        FileStream stream;
+        try
+        {
+            stream = new FileStream(path, FileMode.CreateNew, FileAccess.Write);
+        }
+        catch (IOException) when (File.Exists(path))
+        {
+            return false;
+        }
+
+        // Write and flush failures must surface rather than be mistaken for an existing file
+        await using var writer = new StreamWriter(stream);
+        await writer.WriteAsync(content);
+        return true;
+    }
+
     public async Task<string> ReadAllTextAsync(string path)
     {
         return await File.ReadAllTextAsync(path);
@@ -11,6 +11,9 @@ public class GeminiService(
     private const string GeminiProcessName = "gemini";
     private const string VersionCommand = $"{GeminiProcessName} --version";
 
+    // Reused so serializer metadata is built once rather than per settings file
+    private static readonly JsonSerializerOptions SettingsJsonOptions = new() { WriteIndented = true };
+
     /// <inheritdoc />
     public async Task<bool> LaunchInteractiveAsync(
         string contextFilePath,
@@ -90,7 +93,7 @@ public class GeminiService(
             }
         };
 
-        var json = JsonSerializer.Serialize(configuration, new JsonSerializerOptions { WriteIndented = true });
+        var json = JsonSerializer.Serialize(configuration, SettingsJsonOptions);
 
         await fileSystem.WriteAllTextAsync(configPath, json);
         logger.Info($"Created Gemini configuration file: {configPath}");
@@ -6,19 +6,32 @@ namespace AISwarm.Infrastructure;
 public partial class GitService(
     IProcessLauncher process,
     IFileSystemService fileSystem,
+    IEnvironmentService environment,
     IAppLogger logger) : IGitService
 {
+    private static readonly HashSet<string> ReservedWorktreeNames = new(StringComparer.OrdinalIgnoreCase)
+    {
+        "HEAD", "ORIG_HEAD", "FETCH_HEAD", "MERGE_HEAD", "refs", "objects", "hooks"
+    };
+
     /// <inheritdoc />
     public async Task<bool> IsGitRepositoryAsync()
     {
-        var result = await process.RunAsync("git", "rev-parse --git-dir", Environment.CurrentDirectory, 5000);
+        if (await FindRepositoryRootAsync() != null)
+            return true;
+
+        var result = await RunGitAsync("rev-parse --git-dir", 5000);
         return result.IsSuccess;
     }
 
     /// <inheritdoc />
     public async Task<string?> GetRepositoryRootAsync()
     {
-        var result = await process.RunAsync("git", "rev-parse --show-toplevel", Environment.CurrentDirectory, 5000);
+        var root = await FindRepositoryRootAsync();
+        if (root != null)
+            return root;
+
+        var result = await RunGitAsync("rev-parse --show-toplevel", 5000);
         return result.IsSuccess ? result.StandardOutput.Trim() : null;
     }
 
@@ -26,7 +39,7 @@ public partial class GitService(
     public async Task<Dictionary<string, string>> GetExistingWorktreesAsync()
     {
         var dict = new Dictionary<string, string>();
-        var result = await process.RunAsync("git", "worktree list --porcelain", Environment.CurrentDirectory, 10000);
+        var result = await RunGitAsync("worktree list --porcelain", 10000);
         if (!result.IsSuccess)
             throw new InvalidOperationException($"Failed to list worktrees: {result.StandardError}");
         var lines = result.StandardOutput.Split('\n', StringSplitOptions.RemoveEmptyEntries);
@@ -66,13 +79,15 @@ public partial class GitService(
         if (!IsValidWorktreeName(name))
             throw new ArgumentException($"Invalid worktree name: {name}", nameof(name));
 
-        if (!await IsGitRepositoryAsync())
-            throw new InvalidOperationException("Not in a git repository");
-
-        var repoRoot = await GetRepositoryRootAsync()
-                       ?? throw new InvalidOperationException("Could not determine git repository root");
+        // Root lookup and worktree listing are independent, so overlap the two git launches.
+        // WhenAll rethrows the first faulted task in argument order, keeping repository errors
+        // ahead of listing errors.
+        var repoRootTask = ResolveRepositoryRootAsync();
+        var existingTask = GetExistingWorktreesAsync();
+        await Task.WhenAll(repoRootTask, existingTask);
 
-        var existing = await GetExistingWorktreesAsync();
+        var repoRoot = await repoRootTask;
+        var existing = await existingTask;
         if (existing.TryGetValue(name, out var existingPath))
             return existingPath;
 
@@ -97,7 +112,7 @@ public partial class GitService(
 
         var command = $"worktree add \"{worktreePath}\"" +
                       (string.IsNullOrEmpty(baseBranch) ? "" : $" \"{baseBranch}\"");
-        var result = await process.RunAsync("git", command, Environment.CurrentDirectory, 60000);
+        var result = await RunGitAsync(command, 60000);
         if (!result.IsSuccess)
             throw new InvalidOperationException($"Failed to create worktree: {result.StandardError}");
 
@@ -105,20 +120,91 @@ public partial class GitService(
         return worktreePath;
     }
 
-    [GeneratedRegex("^[a-zA-Z0-9_-]+$")]
-    private static partial Regex WorktreeNameRegex();
+    /// <summary>
+    ///     Repository detection and root lookup in a single git launch. <c>rev-parse</c> prints
+    ///     one line per flag and stops at the first failing one, so an empty output means we are
+    ///     not in a repository while a lone <c>--git-dir</c> line means there is no work tree.
+    /// </summary>
+    private async Task<string> ResolveRepositoryRootAsync()
+    {
+        var root = await FindRepositoryRootAsync();
+        if (root != null)
+            return root;
+
+        var result = await RunGitAsync("rev-parse --git-dir --show-toplevel", 5000);
+        var lines = result.StandardOutput.Split('\n',
+            StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries);
+        if (lines.Length == 0)
+            throw new InvalidOperationException("Not in a git repository");
+        if (!result.IsSuccess || lines.Length < 2)
+            throw new InvalidOperationException("Could not determine git repository root");
+        return lines[1];
+    }
 
-    private bool IsValidWorktreeName(string name)
+    /// <summary>
+    ///     Locate the work tree root in-process by walking up from the current directory to the
+    ///     nearest <c>.git</c> entry (a directory for the main checkout, a <c>gitdir:</c> file for
+    ///     linked worktrees and submodules). Returns <c>null</c> whenever the answer is not
+    ///     clear-cut - GIT_DIR / GIT_WORK_TREE / GIT_CEILING_DIRECTORIES are set, the current
+    ///     directory lies inside a <c>.git</c> directory, or a <c>.git</c> file is not a gitfile -
+    ///     leaving the decision to git itself.
+    /// </summary>
+    private async Task<string?> FindRepositoryRootAsync()
     {
-        if (string.IsNullOrWhiteSpace(name))
-            return false;
-        if (!WorktreeNameRegex().IsMatch(name))
-            return false;
-        if (name.Length < 1 || name.Length > 50)
-            return false;
-        var reservedNames = new[] { "HEAD", "ORIG_HEAD", "FETCH_HEAD", "MERGE_HEAD", "refs", "objects", "hooks" };
-        if (reservedNames.Contains(name, StringComparer.OrdinalIgnoreCase))
+        if (!string.IsNullOrEmpty(environment.GetEnvironmentVariable("GIT_DIR")) ||
+            !string.IsNullOrEmpty(environment.GetEnvironmentVariable("GIT_WORK_TREE")) ||
+            !string.IsNullOrEmpty(environment.GetEnvironmentVariable("GIT_CEILING_DIRECTORIES")))
+            return null;
+
+        for (var dir = environment.CurrentDirectory; !string.IsNullOrEmpty(dir); dir = Path.GetDirectoryName(dir))
+        {
+            // Inside the repository's own metadata there is no work tree to report
+            if (string.Equals(Path.GetFileName(dir), ".git", StringComparison.OrdinalIgnoreCase))
+                return null;
+
+            var dotGit = Path.Combine(dir, ".git");
+            if (fileSystem.DirectoryExists(dotGit))
+                return dir;
+            if (fileSystem.FileExists(dotGit))
+                return await IsGitFileAsync(dotGit) ? dir : null;
+        }
+
+        return null;
+    }
+
+    private async Task<bool> IsGitFileAsync(string path)
+    {
+        try
+        {
+            var content = await fileSystem.ReadAllTextAsync(path);
+            return content.StartsWith("gitdir:", StringComparison.Ordinal);
+        }
+        catch (Exception ex) when (ex is IOException or UnauthorizedAccessException)
+        {
             return false;
-        return true;
+        }
+    }
+
+    /// <summary>
+    ///     Single launch point for git invocations so every call shares the same
+    ///     working directory and captured-output configuration.
+    /// </summary>
+    private Task<ProcessResult> RunGitAsync(
+        string arguments,
+        int timeoutMs)
+    {
+        return process.RunAsync("git", arguments, environment.CurrentDirectory, timeoutMs);
+    }
+
+    // Character set and 1-50 length limit checked in a single pass; \z rather than $ so a
+    // trailing newline cannot slip through
+    [GeneratedRegex(@"^[a-zA-Z0-9_-]{1,50}\z")]
+    private static partial Regex WorktreeNameRegex();
+
+    private static bool IsValidWorktreeName(string name)
+    {
+        return !string.IsNullOrWhiteSpace(name) &&
+               WorktreeNameRegex().IsMatch(name) &&
+               !ReservedWorktreeNames.Contains(name);
     }
 }
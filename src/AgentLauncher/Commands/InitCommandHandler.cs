@@ -18,20 +18,16 @@ public class InitCommandHandler(
         var personasDir = Path.Join(aiswarmDir, "personas");
         var templateFile = Path.Join(personasDir, "template_prompt.md");
 
-        // Check if directory already exists
-        if (fileSystem.DirectoryExists(personasDir))
-        {
-            logger.Warn("Directory .aiswarm/personas already exists. Skipping initialization.");
-            return true;
-        }
-
-        // Create directories
-        fileSystem.CreateDirectory(aiswarmDir);
+        // Create .aiswarm and .aiswarm/personas in one call (parents are created as needed, existing ones kept)
         fileSystem.CreateDirectory(personasDir);
 
-        // Create template persona file
+        // Create template persona file; create-new semantics never overwrite an existing template
         var templateContent = GetTemplatePersonaContent();
-        await fileSystem.WriteAllTextAsync(templateFile, templateContent);
+        if (!await fileSystem.TryCreateFileAsync(templateFile, templateContent))
+        {
+            logger.Warn("File .aiswarm/personas/template_prompt.md already exists. Skipping initialization.");
+            return true;
+        }
 
         logger.Info($"Initialized .aiswarm directory at: {aiswarmDir}");
         logger.Info($"Created personas directory: {personasDir}");
@@ -17,10 +17,19 @@ public static class CommandFactory
         };
         agentOption.AddAlias("-a");
 
+        // Persona discovery only runs when --agent is supplied or completed, not for every invocation
         var contextService = serviceProvider.GetRequiredService<IContextService>();
-        var availableAgents = contextService.GetAvailableAgentTypes().ToArray();
-        if (availableAgents.Length > 0)
-            agentOption.FromAmong(availableAgents);
+        agentOption.AddCompletions(_ => contextService.GetAvailableAgentTypes());
+        agentOption.AddValidator(result =>
+        {
+            // Exact, case-sensitive match as FromAmong did: the value becomes the agent's PersonaId,
+            // which task routing compares ordinally
+            var value = result.GetValueOrDefault<string?>();
+            if (!string.IsNullOrEmpty(value) &&
+                !contextService.GetAvailableAgentTypes().Contains(value, StringComparer.Ordinal))
+                result.ErrorMessage =
+                    $"Unknown agent type '{value}'. Use --list or -l to see available agent types.";
+        });
 
         var modelOption = new Option<string?>(
             "--model",
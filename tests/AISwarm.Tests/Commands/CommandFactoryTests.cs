@@ -0,0 +1,72 @@
+using System.CommandLine;
+using System.CommandLine.IO;
+using AgentLauncher.Services;
+using AISwarm.Infrastructure;
+using Microsoft.Extensions.DependencyInjection;
+using Moq;
+using Shouldly;
+
+namespace AISwarm.Tests.Commands;
+
+public class CommandFactoryTests
+{
+    private readonly Mock<IContextService> _contextService = new();
+
+    private RootCommand SystemUnderTest
+    {
+        get
+        {
+            var services = new ServiceCollection();
+            services.AddSingleton(_contextService.Object);
+            return CommandFactory.CreateRootCommand(services.BuildServiceProvider());
+        }
+    }
+
+    public CommandFactoryTests()
+    {
+        _contextService.Setup(s => s.GetAvailableAgentTypes()).Returns(["implementer", "planner"]);
+    }
+
+    [Fact]
+    public void WhenAgentTypeIsAvailable_ShouldParseWithoutErrors()
+    {
+        var result = SystemUnderTest.Parse("--agent planner");
+
+        result.Errors.ShouldBeEmpty();
+    }
+
+    [Fact]
+    public void WhenAgentTypeIsUnknown_ShouldReportError()
+    {
+        var result = SystemUnderTest.Parse("--agent astronaut");
+
+        result.Errors.ShouldContain(e => e.Message.Contains("Unknown agent type 'astronaut'"));
+    }
+
+    [Fact]
+    public void WhenAgentTypeCaseDiffers_ShouldReportError()
+    {
+        var result = SystemUnderTest.Parse("--agent Planner");
+
+        result.Errors.ShouldContain(e => e.Message.Contains("Unknown agent type 'Planner'"));
+    }
+
+    [Fact]
+    public void WhenAgentNotSpecified_ShouldNotDiscoverAgentTypes()
+    {
+        var result = SystemUnderTest.Parse("--list-worktrees");
+
+        result.Errors.ShouldBeEmpty();
+        _contextService.Verify(s => s.GetAvailableAgentTypes(), Times.Never);
+    }
+
+    [Fact]
+    public void WhenHelpRequested_ShouldListAvailableAgentTypes()
+    {
+        var console = new TestConsole();
+
+        SystemUnderTest.Invoke("--help", console);
+
+        console.Out.ToString()!.ShouldContain("implementer|planner");
+    }
+}
@@ -74,4 +74,20 @@ public class InitCommandHandlerTests
         result.ShouldBeTrue();
         _logger.Warnings.ShouldContain(w => w.Contains("already exists"));
     }
+
+    [Fact]
+    public async Task WhenPersonasDirectoryExistsWithoutTemplate_ShouldCreateTemplatePersonaFile()
+    {
+        // Arrange
+        _environment.CurrentDirectory = "/test/repo";
+        _fileSystem.AddDirectory("/test/repo/.aiswarm/personas");
+
+        // Act
+        var result = await SystemUnderTest.RunAsync();
+
+        // Assert
+        result.ShouldBeTrue();
+        _fileSystem.FileExists("/test/repo/.aiswarm/personas/template_prompt.md").ShouldBeTrue();
+        _logger.Warnings.ShouldBeEmpty();
+    }
 }
@@ -44,7 +44,7 @@ public class LaunchAgentCommandHandlerTests
         var scopeService = new DatabaseScopeService(new TestDbContextFactory(options));
         _scopeService = scopeService;
 
-        _git = new GitService(_process, _fs, _logger);
+        _git = new GitService(_process, _fs, _env, _logger);
 
         // Create a real GeminiService using PassThroughProcessLauncher via terminal service
         var terminalService = new WindowsTerminalService(_process);
@@ -169,10 +169,8 @@ public class LaunchAgentCommandHandlerTests
         public async Task WhenWorktreeSpecified_ShouldCreateWorktree_ThenContext_InNewDirectory()
         {
             // Arrange expected git command sequence
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-                new ProcessResult(true, ".git", string.Empty, 0));
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-                new ProcessResult(true, "/repo", string.Empty, 0));
+            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+                new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree list"),
                 new ProcessResult(true, string.Empty, string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree add"),
@@ -215,10 +213,8 @@ public class LaunchAgentCommandHandlerTests
         [Fact]
         public async Task WhenWorktreeAddFails_ShouldLogErrorAndAbort()
         {
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-                new ProcessResult(true, ".git", string.Empty, 0));
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-                new ProcessResult(true, "/repo", string.Empty, 0));
+            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+                new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree list"),
                 new ProcessResult(true, string.Empty, string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree add"),
@@ -243,10 +239,8 @@ public class LaunchAgentCommandHandlerTests
         public async Task WhenWorktreeAlreadyExists_ShouldSucceed()
         {
             var porcelain = "worktree /repo/worktrees/feature_dup\nbranch refs/heads/feature_dup\n";
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-                new ProcessResult(true, ".git", string.Empty, 0));
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-                new ProcessResult(true, "/repo", string.Empty, 0));
+            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+                new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree list"),
                 new ProcessResult(true, porcelain, string.Empty, 0));
             _context.Setup(c => c.CreateContextFile(It.IsAny<string>(), It.IsAny<string>()))
@@ -268,10 +262,8 @@ public class LaunchAgentCommandHandlerTests
         [Fact]
         public async Task WhenWorktreeCreated_ShouldLaunchGeminiFromWorktree()
         {
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-                new ProcessResult(true, ".git", string.Empty, 0));
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-                new ProcessResult(true, "/repo", string.Empty, 0));
+            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+                new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree list"),
                 new ProcessResult(true, string.Empty, string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree add"),
@@ -305,10 +297,8 @@ public class LaunchAgentCommandHandlerTests
         [Fact]
         public async Task WhenDirectoryAndWorktreeProvided_WorktreePathShouldOverride()
         {
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-                new ProcessResult(true, ".git", string.Empty, 0));
-            _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-                new ProcessResult(true, "/repo", string.Empty, 0));
+            _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+                new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree list"),
                 new ProcessResult(true, string.Empty, string.Empty, 0));
             _process.Enqueue("git", a => a.StartsWith("worktree add"),
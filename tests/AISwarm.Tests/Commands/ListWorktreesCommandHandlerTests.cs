@@ -12,7 +12,7 @@ public class ListWorktreesCommandHandlerTests
     private readonly PassThroughProcessLauncher _process = new();
 
     private ListWorktreesCommandHandler SystemUnderTest => new(
-        new GitService(_process, _fs, _logger),
+        new GitService(_process, _fs, new TestEnvironmentService(), _logger),
         _logger);
 
     [Fact]
@@ -1,9 +1,12 @@
+using System.Text;
 using AISwarm.Infrastructure;
+using AISwarm.Tests.TestDoubles;
 using Shouldly;
 
 namespace AISwarm.Tests.Services;
 
-public class ContextServiceTests : ISystemUnderTest<ContextService>
+public class ContextServiceTests(TempDirectoryFixture tempDirectory)
+    : ISystemUnderTest<ContextService>, IClassFixture<TempDirectoryFixture>
 {
     private ContextService? _systemUnderTest;
 
@@ -15,66 +18,157 @@ public class ContextServiceTests : ISystemUnderTest<ContextService>
     {
         // Arrange
         var agentType = "implementer";
-        var workingDirectory = Path.GetTempPath();
-        var tempDir = Path.Combine(workingDirectory, Guid.NewGuid().ToString());
-        Directory.CreateDirectory(tempDir);
+        var tempDir = tempDirectory.CreateSubdirectory();
+
+        // Act
+        var contextPath = await SystemUnderTest
+            .CreateContextFileWithAgentId(
+                agentType,
+                tempDir,
+                null);
+
+        // Assert
+        contextPath.ShouldNotBeNullOrEmpty();
+        File.Exists(contextPath).ShouldBeTrue();
+        var contextContent = await File.ReadAllTextAsync(contextPath);
+        contextContent.ShouldNotContain("Your Agent ID");
+        contextContent.ShouldNotContain("mcp_aiswarm_get_next_task");
+    }
+
+    [Fact]
+    public async Task WhenCreateContextFileWithAgentId_ShouldAppendMcpToolInstructions()
+    {
+        // Arrange
+        var agentType = "implementer";
+        var tempDir = tempDirectory.CreateSubdirectory();
+        var agentId = "test-agent-123";
+
+        // Act
+        var contextPath = await SystemUnderTest.CreateContextFileWithAgentId(
+            agentType,
+            tempDir,
+            agentId);
+
+        // Assert
+        contextPath.ShouldNotBeNullOrEmpty();
+        File.Exists(contextPath).ShouldBeTrue();
+        var contextContent = await File.ReadAllTextAsync(contextPath);
+        contextContent.ShouldContain("Your Agent ID");
+        contextContent.ShouldContain($"Your unique agent ID is: `{agentId}`");
+        contextContent.ShouldContain("mcp_aiswarm_get_next_task");
+        contextContent.ShouldContain("mcp_aiswarm_create_task");
+        contextContent.ShouldContain("mcp_aiswarm_report_task_completion");
+        contextContent.ShouldContain($"mcp_aiswarm_get_next_task(agentId='{agentId}')");
+    }
+
+    [Fact]
+    public async Task WhenPersonaFileAddedAfterLookup_ShouldDiscoverNewAgentType()
+    {
+        // Arrange
+        var tempDir = tempDirectory.CreateSubdirectory();
+        var previous = Environment.GetEnvironmentVariable("AISWARM_PERSONAS_PATH");
+        Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", tempDir);
 
         try
         {
+            // Age the directory past the racy-write window so the first listing is cached
+            Directory.SetLastWriteTimeUtc(tempDir, DateTime.UtcNow.AddMinutes(-5));
+            SystemUnderTest.IsValidAgentType("cachecheck").ShouldBeFalse();
+
             // Act
-            var contextPath = await SystemUnderTest
-                .CreateContextFileWithAgentId(
-                    agentType,
-                    tempDir,
-                    null);
+            await File.WriteAllTextAsync(Path.Combine(tempDir, "cachecheck_prompt.md"), "# Cache check");
 
             // Assert
-            contextPath.ShouldNotBeNullOrEmpty();
-            File.Exists(contextPath).ShouldBeTrue();
-            var contextContent = await File.ReadAllTextAsync(contextPath);
-            contextContent.ShouldNotContain("Your Agent ID");
-            contextContent.ShouldNotContain("mcp_aiswarm_get_next_task");
+            SystemUnderTest.IsValidAgentType("cachecheck").ShouldBeTrue();
         }
         finally
         {
-            if (Directory.Exists(tempDir))
-                Directory.Delete(tempDir, true);
+            Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", previous);
         }
     }
 
     [Fact]
-    public async Task WhenCreateContextFileWithAgentId_ShouldAppendMcpToolInstructions()
+    public async Task WhenPersonaDirectoryUnchanged_ShouldReuseCachedListing()
     {
         // Arrange
-        var agentType = "implementer";
-        var workingDirectory = Path.GetTempPath();
-        var tempDir = Path.Combine(workingDirectory, Guid.NewGuid().ToString());
-        var agentId = "test-agent-123";
-        Directory.CreateDirectory(tempDir);
+        var tempDir = tempDirectory.CreateSubdirectory();
+        var lastWriteTimeUtc = DateTime.UtcNow.AddMinutes(-5);
+        Directory.SetLastWriteTimeUtc(tempDir, lastWriteTimeUtc);
+        var previous = Environment.GetEnvironmentVariable("AISWARM_PERSONAS_PATH");
+        Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", tempDir);
+
+        try
+        {
+            SystemUnderTest.IsValidAgentType("stalecheck").ShouldBeFalse();
+
+            // Act - add a persona but restore the directory timestamp the listing was cached under
+            await File.WriteAllTextAsync(Path.Combine(tempDir, "stalecheck_prompt.md"), "# Stale check");
+            Directory.SetLastWriteTimeUtc(tempDir, lastWriteTimeUtc);
+
+            // Assert
+            SystemUnderTest.IsValidAgentType("stalecheck").ShouldBeFalse();
+        }
+        finally
+        {
+            Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", previous);
+        }
+    }
+
+    [Fact]
+    public void WhenPersonaDirectoryTimestampLookupFails_ShouldSkipDirectory()
+    {
+        // Arrange - a path component longer than the file system allows makes the timestamp lookup throw
+        var unreachableDir = Path.Combine(tempDirectory.Root, new string('x', 300), "personas");
+        var previous = Environment.GetEnvironmentVariable("AISWARM_PERSONAS_PATH");
+        Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", unreachableDir);
+
+        try
+        {
+            // Act
+            var agentTypes = SystemUnderTest.GetAvailableAgentTypes().ToList();
+
+            // Assert
+            agentTypes.ShouldContain("implementer");
+            SystemUnderTest.IsValidAgentType("unreachable").ShouldBeFalse();
+        }
+        finally
+        {
+            Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", previous);
+        }
+    }
+
+    [Fact]
+    public async Task WhenExternalPersonaIsUtf16_ShouldWriteUtf8ContextFile()
+    {
+        // Arrange
+        var personasDir = tempDirectory.CreateSubdirectory();
+        var workingDir = tempDirectory.CreateSubdirectory();
+        await File.WriteAllTextAsync(
+            Path.Combine(personasDir, "notepad_prompt.md"),
+            "# Notepad persona\nCafé instructions",
+            Encoding.Unicode);
+        var previous = Environment.GetEnvironmentVariable("AISWARM_PERSONAS_PATH");
+        Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", personasDir);
 
         try
         {
             // Act
             var contextPath = await SystemUnderTest.CreateContextFileWithAgentId(
-                agentType,
-                tempDir,
-                agentId);
+                "notepad",
+                workingDir,
+                "test-agent-123");
 
             // Assert
-            contextPath.ShouldNotBeNullOrEmpty();
-            File.Exists(contextPath).ShouldBeTrue();
-            var contextContent = await File.ReadAllTextAsync(contextPath);
-            contextContent.ShouldContain("Your Agent ID");
-            contextContent.ShouldContain($"Your unique agent ID is: `{agentId}`");
-            contextContent.ShouldContain("mcp_aiswarm_get_next_task");
-            contextContent.ShouldContain("mcp_aiswarm_create_task");
-            contextContent.ShouldContain("mcp_aiswarm_report_task_completion");
-            contextContent.ShouldContain($"mcp_aiswarm_get_next_task(agentId='{agentId}')");
+            var bytes = await File.ReadAllBytesAsync(contextPath);
+            bytes.ShouldNotContain((byte)0);
+            bytes[0].ShouldBe((byte)'#');
+            var content = Encoding.UTF8.GetString(bytes);
+            content.ShouldStartWith("# Notepad persona\nCafé instructions");
+            content.ShouldContain("Your unique agent ID is: `test-agent-123`");
         }
         finally
         {
-            if (Directory.Exists(tempDir))
-                Directory.Delete(tempDir, true);
+            Environment.SetEnvironmentVariable("AISWARM_PERSONAS_PATH", previous);
         }
     }
 }
@@ -6,11 +6,12 @@ namespace AISwarm.Tests.Services;
 
 public class CreateWorkTreeTests : ISystemUnderTest<GitService>
 {
+    private readonly TestEnvironmentService _environment = new();
     private readonly FakeFileSystemService _fs = new();
     private readonly TestLogger _logger = new();
     private readonly PassThroughProcessLauncher _process = new();
 
-    public GitService SystemUnderTest => new(_process, _fs, _logger);
+    public GitService SystemUnderTest => new(_process, _fs, _environment, _logger);
 
     [Fact]
     public async Task ShouldReturnExistingPath_WhenWorktreeAlreadyListed()
@@ -37,10 +38,8 @@ HEAD b7715788c0a2df79fa7c5cab30593747937420c7
 branch refs/heads/aiswarm-review-event-subscription";
 
 
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-            new ProcessResult(true, ".git", string.Empty, 0));
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-            new ProcessResult(true, "/repo", string.Empty, 0));
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
         _process.Enqueue("git", a => a.StartsWith("worktree list"),
             new ProcessResult(true, worktreeListOutput, string.Empty, 0));
 
@@ -56,6 +55,19 @@ branch refs/heads/aiswarm-review-event-subscription";
         ex.Message.ShouldContain("Invalid worktree name");
     }
 
+    [Theory]
+    [InlineData("HEAD")]
+    [InlineData("refs")]
+    [InlineData("a123456789b123456789c123456789d123456789e123456789f")]
+    [InlineData("a123456789b123456789c123456789d123456789e123456789\n")]
+    [InlineData(null)]
+    public async Task ShouldFail_WhenWorktreeNameIsReservedOrTooLong(string? name)
+    {
+        var ex = await Should.ThrowAsync<ArgumentException>(() =>
+            SystemUnderTest.CreateWorktreeAsync(name!));
+        ex.Message.ShouldContain("Invalid worktree name");
+    }
+
     [Fact]
     public async Task ShouldCreateNewWorktree_WhenNotAlreadyExisting()
     {
@@ -70,10 +82,8 @@ branch refs/heads/aiswarm-code-review-event-subscription";
 
         var existingPath = "/repo/aiswarm-new-feature";
 
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-            new ProcessResult(true, ".git", string.Empty, 0));
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-            new ProcessResult(true, "/repo", string.Empty, 0));
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
         _process.Enqueue("git", a => a.StartsWith("worktree list"),
             new ProcessResult(true, worktreeListOutput, string.Empty, 0));
         _process.Enqueue("git", a => a.StartsWith($"worktree add \"{existingPath}\""),
@@ -89,7 +99,7 @@ branch refs/heads/aiswarm-code-review-event-subscription";
     [Fact]
     public async Task ShouldThrow_WhenNotInGitRepository()
     {
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
             new ProcessResult(false, string.Empty, "fatal: not a git repository (or any of the parent directories): .git", 128));
 
         var ex = await Should.ThrowAsync<InvalidOperationException>(() =>
@@ -100,10 +110,8 @@ branch refs/heads/aiswarm-code-review-event-subscription";
     [Fact]
     public async Task ShouldThrow_WhenCannotDetermineRepositoryRoot()
     {
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-            new ProcessResult(true, ".git", string.Empty, 0));
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-            new ProcessResult(false, string.Empty, "fatal: not a git repository (or any of the parent directories): .git", 128));
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(false, ".\n", "fatal: this operation must be run in a work tree", 128));
 
         var ex = await Should.ThrowAsync<InvalidOperationException>(() =>
             SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature"));
@@ -118,10 +126,8 @@ branch refs/heads/aiswarm-code-review-event-subscription";
 HEAD 1bd36db7340b7e680f1e3037c83e592bd24971a4
 branch refs/heads/master";
 
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir"),
-            new ProcessResult(true, ".git", string.Empty, 0));
-        _process.Enqueue("git", a => a.StartsWith("rev-parse --show-toplevel"),
-            new ProcessResult(true, "/repo", string.Empty, 0));
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
         _process.Enqueue("git", a => a.StartsWith("worktree list"),
             new ProcessResult(true, worktreeListOutput, string.Empty, 0));
         _process.Enqueue("git", a => a.StartsWith("worktree add"),
@@ -131,4 +137,99 @@ branch refs/heads/master";
             SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature"));
         ex.Message.ShouldBe("Failed to create worktree: fatal: A branch named 'aiswarm-new-feature' already exists.");
     }
+
+    [Fact]
+    public async Task ShouldResolveRepository_WithSingleRevParseInvocation()
+    {
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
+
+        await SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature");
+
+        _process.Invocations.Count(i => i.Arguments.StartsWith("rev-parse")).ShouldBe(1);
+    }
+
+    [Fact]
+    public async Task ShouldResolveRepositoryInProcess_WhenDotGitDirectoryPresent()
+    {
+        var repoRoot = _environment.CurrentDirectory;
+        _fs.AddDirectory(Path.Combine(repoRoot, ".git"));
+
+        var result = await SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature");
+
+        var expected = Path.Combine(
+            Path.GetDirectoryName(repoRoot)!,
+            $"{Path.GetFileName(repoRoot)}-aiswarm-new-feature");
+        result.ShouldBe(expected);
+        _process.Invocations.ShouldNotContain(i => i.Arguments.StartsWith("rev-parse"));
+    }
+
+    [Fact]
+    public async Task ShouldResolveRepositoryInProcess_WhenDotGitFilePointsToGitDir()
+    {
+        var repoRoot = _environment.CurrentDirectory;
+        await _fs.WriteAllTextAsync(Path.Combine(repoRoot, ".git"), "gitdir: /main/.git/worktrees/repo\n");
+
+        var result = await SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature");
+
+        var expected = Path.Combine(
+            Path.GetDirectoryName(repoRoot)!,
+            $"{Path.GetFileName(repoRoot)}-aiswarm-new-feature");
+        result.ShouldBe(expected);
+        _process.Invocations.ShouldNotContain(i => i.Arguments.StartsWith("rev-parse"));
+    }
+
+    [Fact]
+    public async Task ShouldDeferToGit_WhenDotGitFileIsNotAGitFile()
+    {
+        await _fs.WriteAllTextAsync("/repo/.git", "not a gitfile");
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(false, string.Empty, "fatal: invalid gitfile format: /repo/.git", 128));
+
+        var ex = await Should.ThrowAsync<InvalidOperationException>(() =>
+            SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature"));
+
+        ex.Message.ShouldContain("Not in a git repository");
+    }
+
+    [Fact]
+    public async Task ShouldDeferToGit_WhenInsideDotGitDirectory()
+    {
+        _environment.CurrentDirectory = "/repo/.git/hooks";
+        _fs.AddDirectory("/repo/.git");
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(false, "/repo/.git\n", "fatal: this operation must be run in a work tree", 128));
+
+        var ex = await Should.ThrowAsync<InvalidOperationException>(() =>
+            SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature"));
+
+        ex.Message.ShouldContain("Could not determine git repository root");
+    }
+
+    [Fact]
+    public async Task ShouldDeferToGit_WhenCeilingDirectoriesSet()
+    {
+        _environment.SetVar("GIT_CEILING_DIRECTORIES", "/");
+        _fs.AddDirectory("/repo/.git");
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
+
+        await SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature");
+
+        _process.Invocations.Count(i => i.Arguments.StartsWith("rev-parse")).ShouldBe(1);
+    }
+
+    [Fact]
+    public async Task ShouldThrow_WhenWorktreeListFails()
+    {
+        _process.Enqueue("git", a => a.StartsWith("rev-parse --git-dir --show-toplevel"),
+            new ProcessResult(true, ".git\n/repo\n", string.Empty, 0));
+        _process.Enqueue("git", a => a.StartsWith("worktree list"),
+            new ProcessResult(false, string.Empty, "fatal: unable to read worktrees", 128));
+
+        var ex = await Should.ThrowAsync<InvalidOperationException>(() =>
+            SystemUnderTest.CreateWorktreeAsync("aiswarm-new-feature"));
+
+        ex.Message.ShouldContain("Failed to list worktrees");
+    }
 }
@@ -0,0 +1,43 @@
+using AISwarm.Infrastructure;
+using AISwarm.Tests.TestDoubles;
+using Shouldly;
+
+namespace AISwarm.Tests.Services;
+
+public class FileSystemServiceTests(TempDirectoryFixture tempDirectory)
+    : ISystemUnderTest<FileSystemService>, IClassFixture<TempDirectoryFixture>
+{
+    public FileSystemService SystemUnderTest
+    {
+        get;
+    } = new();
+
+    [Fact]
+    public async Task WhenFileDoesNotExist_TryCreateFileAsync_ShouldWriteContentAndReturnTrue()
+    {
+        // Arrange
+        var path = Path.Combine(tempDirectory.CreateSubdirectory(), "template_prompt.md");
+
+        // Act
+        var created = await SystemUnderTest.TryCreateFileAsync(path, "# Template");
+
+        // Assert
+        created.ShouldBeTrue();
+        (await File.ReadAllTextAsync(path)).ShouldBe("# Template");
+    }
+
+    [Fact]
+    public async Task WhenFileAlreadyExists_TryCreateFileAsync_ShouldReturnFalseAndLeaveContent()
+    {
+        // Arrange
+        var path = Path.Combine(tempDirectory.CreateSubdirectory(), "template_prompt.md");
+        await File.WriteAllTextAsync(path, "# Existing");
+
+        // Act
+        var created = await SystemUnderTest.TryCreateFileAsync(path, "# Template");
+
+        // Assert
+        created.ShouldBeFalse();
+        (await File.ReadAllTextAsync(path)).ShouldBe("# Existing");
+    }
+}
@@ -18,7 +18,9 @@ public class FakeFileSystemService : IFileSystemService
 
     public void CreateDirectory(string path)
     {
-        _directories.Add(Norm(path));
+        // Mirror Directory.CreateDirectory, which also creates any missing parent directories
+        for (var dir = path; !string.IsNullOrEmpty(dir); dir = Path.GetDirectoryName(dir))
+            _directories.Add(Norm(dir));
     }
 
     public bool FileExists(string path)
@@ -61,6 +63,17 @@ public class FakeFileSystemService : IFileSystemService
         await Task.CompletedTask;
     }
 
+    public async Task<bool> TryCreateFileAsync(
+        string path,
+        string content)
+    {
+        if (FileExists(path))
+            return false;
+
+        await WriteAllTextAsync(path, content);
+        return true;
+    }
+
     public async Task<string> ReadAllTextAsync(string path)
     {
         var normalizedPath = Norm(path);
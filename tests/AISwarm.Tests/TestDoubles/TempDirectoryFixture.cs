@@ -0,0 +1,31 @@
+namespace AISwarm.Tests.TestDoubles;
+
+/// <summary>
+///     Class-level fixture that owns a single temporary root directory for all tests in a class.
+///     Tests isolate themselves with <see cref="CreateSubdirectory" />; the whole tree is removed once on disposal.
+/// </summary>
+public sealed class TempDirectoryFixture : IDisposable
+{
+    public TempDirectoryFixture()
+    {
+        Directory.CreateDirectory(Root);
+    }
+
+    public string Root
+    {
+        get;
+    } = Path.Combine(Path.GetTempPath(), "aiswarm-tests-" + Guid.NewGuid().ToString("N"));
+
+    public void Dispose()
+    {
+        if (Directory.Exists(Root))
+            Directory.Delete(Root, true);
+    }
+
+    public string CreateSubdirectory()
+    {
+        var path = Path.Combine(Root, Guid.NewGuid().ToString("N"));
+        Directory.CreateDirectory(path);
+        return path;
+    }
+}